@@ -1,132 +1,363 @@
-import json
+import atexit
+import logging
 import os
-from datetime import datetime
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import date, datetime
 from uuid import uuid4
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 
 from engine.curriculum import load_curriculum
 from engine.evaluator import build_filled_sentence, evaluate_answer
 from engine.generator import generate_exercise_auto as generate_exercise, get_exercise_type_info, validate_exercise_type
-from engine.logger import log_exercise_to_session
+from engine.json_utils import dumps, load_file, loads, replace_file
+from engine.logger import (
+    iter_session_index,
+    latest_session_version,
+    load_latest_session_summary,
+    log_exercise_to_session,
+    session_index_version
+)
 from engine.planner import select_review_and_new_items
-from engine.profile import load_user_profile, save_user_profile, update_user_profile
+from engine.profile import get_cached_profile, load_user_profile, save_user_profile, update_user_profile
 from engine.utils import normalize_answer_for_comparison,normalize_grammar_id
 from engine.vocab_manager import get_vocab_manager
 from engine.generator import get_difficulty_info
 from engine.profile import get_mastery_progression_summary
 from engine.difficulty_system import (
-    DifficultyProgressionManager, 
     ExerciseDifficulty,
+    get_difficulty_manager,
     integrate_with_exercise_generator,
     update_profile_with_difficulty_progress
 )
 
+# LOG_LEVEL=DEBUG shows the answer comparison details, WARNING quiets per-request logs
+log_level = (os.environ.get("LOG_LEVEL") or "INFO").upper()
+# getLevelName maps known names to their number (and unknown ones to a string)
+log_level_known = isinstance(logging.getLevelName(log_level), int)
+logging.basicConfig(level=log_level if log_level_known else logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+if not log_level_known:
+    logger.warning("⚠️ Unknown LOG_LEVEL %r, using INFO", os.environ["LOG_LEVEL"])
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Route jsonify() and request.get_json() through engine.json_utils (orjson
+    when installed). Values orjson cannot encode fall back to Flask's encoder.
+    """
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return dumps(obj).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
 # Initialize Flask app to serve UI and API
 app = Flask(__name__, static_folder="web", static_url_path="/")
-# Align with engine.logger SESSION_DIR
-SESSION_LOGS_DIR = "sessions"
+app.json = OrjsonProvider(app)
+# Compact, unsorted output even under app.run(debug=True); also applies
+# to the fallback encoder
+app.json.compact = True
+app.json.sort_keys = False
 
 # Initialize vocabulary manager on app startup
-print("🔧 Initializing vocabulary manager...")
+logger.info("🔧 Initializing vocabulary manager...")
 vocab_manager = get_vocab_manager()
 vocab_stats = vocab_manager.get_stats()
-print(f"✅ Vocabulary manager ready: {vocab_stats.get('total_words', 0)} words loaded")
-print(f"   Distribution: {vocab_stats.get('by_tags', {})}")
+logger.info("✅ Vocabulary manager ready: %s words loaded", vocab_stats.get('total_words', 0))
+logger.info("   Distribution: %s", vocab_stats.get('by_tags', {}))
 
-# Utility to load the most recent session summary
-def load_latest_session_summary():
-    try:
-        files = [f for f in os.listdir(SESSION_LOGS_DIR) if f.endswith(".json")]
-    except FileNotFoundError:
-        return None
-    if not files:
+# Stateless difficulty rules, shared by the difficulty endpoints
+difficulty_manager = get_difficulty_manager()
+
+# Exercise type metadata is fixed at import time; serialize it once
+EXERCISE_TYPE_INFO = get_exercise_type_info()
+EXERCISE_TYPE_INFO_JSON = dumps(EXERCISE_TYPE_INFO)
+
+def get_json_body():
+    """Parse the request body as a JSON object; returns None if it is missing or malformed."""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds `etag`, else None."""
+    if etag is None or not request.if_none_match.contains(etag):
         return None
-    latest_file = sorted(files)[-1]
-    with open(os.path.join(SESSION_LOGS_DIR, latest_file), "r", encoding="utf-8") as f:
-        session_log = json.load(f)
-    return session_log.get("summary")
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, must-revalidate'
+    return response
+
+def json_response(payload, status=200):
+    """
+    Serialize payload with the shared JSON helpers (orjson when available)
+    and wrap it in a Response, skipping jsonify on frequently hit endpoints.
+    """
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+def with_etag(response, etag):
+    """Tag a response so browsers revalidate it with If-None-Match."""
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, must-revalidate'
+    return response
+
+# -- Answer comparison per exercise type --
+# The expected answer only depends on the exercise, so it is computed
+# once when the exercise is generated. Comparers then turn a submitted
+# answer into (comparison_text, user_answer); user_answer is the
+# submitted answer in the shape kept in the exercise history.
+
+def _expected_text(exercise):
+    """Translation and any other free-text exercise"""
+    return str(exercise.get('expected_answer', '')).strip()
+
+def _expected_fill_in_blank(exercise):
+    if '___' not in exercise.get('prompt', ''):
+        # Fallback for prompts without blanks
+        return _expected_text(exercise)
+    return exercise.get('filled_sentence', '').strip()
+
+def _expected_filled_sentence(exercise):
+    return exercise.get('filled_sentence', '').strip()
+
+def _expected_multiple_choice(exercise):
+    return exercise.get('correct_answer', '')
+
+def _expected_error_correction(exercise):
+    expected = exercise.get('correct_answer', '').strip().upper()
+
+    # Additional validation - make sure the expected answer is a valid choice
+    if expected not in ['A', 'B', 'C', 'D']:
+        logger.warning("⚠️ Invalid correct_answer in exercise: %s", expected)
+        expected = 'A'  # Fallback, though this shouldn't happen with validation
+
+    # Store the sentence text as well for more detailed feedback
+    exercise['expected_sentence_text'] = exercise.get('sentences', {}).get(expected, '')
+    return expected
+
+def _expected_sentence_building(exercise):
+    expected_order = exercise.get('expected_answer', [])
+    return ' '.join(expected_order) if isinstance(expected_order, list) else str(expected_order)
+
+_EXPECTED_ANSWERS = {
+    'fill_in_blank': _expected_fill_in_blank,
+    'fill_multiple_blanks': _expected_filled_sentence,
+    'multiple_choice': _expected_multiple_choice,
+    'error_correction': _expected_error_correction,
+    'sentence_building': _expected_sentence_building,
+    'translation': _expected_text,
+}
+
+def _compare_text(matching, user_answer, expected):
+    return user_answer.strip(), user_answer
+
+def _compare_fill_in_blank(matching, user_answer, expected):
+    prompt = matching.get('prompt', '')
+    answer = user_answer.strip()
+    # Check if user provided the complete sentence or just the missing word
+    if '___' not in prompt or answer == expected:
+        return answer, user_answer
+    # User provided just the missing word - build sentence and compare
+    return build_filled_sentence(prompt, user_answer).strip(), user_answer
+
+# Deletes both quote characters in one pass
+_STRIP_QUOTES = str.maketrans('', '', '"\'')
+
+def _compare_fill_multiple_blanks(matching, user_answer, expected):
+    if isinstance(user_answer, str):
+        # If user_answer is a string, try to parse it as comma-separated values
+        user_answer = [ans.strip().translate(_STRIP_QUOTES) for ans in user_answer.split(',')]
+
+    # Check if user provided complete sentence or individual answers
+    if len(user_answer) == 1 and user_answer[0].strip() == expected:
+        return expected, user_answer
+    return build_filled_sentence(matching.get('prompt', ''), user_answer).strip(), user_answer
+
+def _compare_choice(matching, user_answer, expected):
+    # Compare the choice letter (A, B, C, D)
+    return user_answer.strip().upper(), user_answer
+
+def _compare_sentence_building(matching, user_answer, expected):
+    # Compare ordered word list
+    if isinstance(user_answer, str):
+        user_answer = user_answer.split()  # Simple split for now
+    return ' '.join(user_answer), user_answer
+
+_ANSWER_COMPARERS = {
+    'fill_in_blank': _compare_fill_in_blank,
+    'fill_multiple_blanks': _compare_fill_multiple_blanks,
+    'multiple_choice': _compare_choice,
+    'error_correction': _compare_choice,
+    'sentence_building': _compare_sentence_building,
+    'translation': _compare_text,
+}
+# Exercise types whose comparer also takes the answer as a list of strings
+_LIST_ANSWER_TYPES = frozenset(('fill_multiple_blanks', 'sentence_building'))
+
+# -- Exercise fields sent to the client --
+# (response key, exercise key, default); an exercise key of None sends the
+# default as a fixed value.
+_RESPONSE_FIELDS = (
+    ('exercise_type', 'exercise_type', None),
+    ('prompt', 'prompt', None),
+    ('glossary', 'glossary', None),
+    ('grammar_focus', 'grammar_focus', []),
+    ('translated_sentence', 'translated_sentence', ''),
+)
+_TEXT_ANSWER_FIELDS = (
+    ('expected_answer', 'expected_answer', None),
+    ('filled_sentence', 'filled_sentence', None),
+)
+_RESPONSE_EXTRA_FIELDS = {
+    'multiple_choice': (
+        ('choices', 'choices', {}),
+        ('explanation', 'explanation', ''),
+    ),
+    'error_correction': (
+        ('sentences', 'sentences', {}),
+        ('instruction', 'prompt', 'Select the correct sentence'),
+    ),
+    'sentence_building': (
+        ('word_pieces', 'word_pieces', []),
+        ('instruction', None, 'Arrange these words in the correct order'),
+    ),
+    'fill_in_blank': _TEXT_ANSWER_FIELDS,
+    'fill_multiple_blanks': _TEXT_ANSWER_FIELDS,
+    'translation': _TEXT_ANSWER_FIELDS,
+}
 
 class ExerciseSessionManager:
     def __init__(self):
+        # Guards session and profile state: the server handles requests on
+        # several threads, so start/end/evaluate may run concurrently.
+        self._lock = threading.RLock()
         self.current_session = []
+        self._exercise_index = {}  # exercise_id -> exercise dict in current_session
+        self._expected_answers = {}  # exercise_id -> (expected, normalized expected)
         self.profile = load_user_profile("user_profile.json")
-        self.recent_exercises = []
+        self.recent_exercises = deque(maxlen=10)  # last exercises, for prompt context
         self.session_start_time = datetime.now()
+        self._session_start_monotonic = time.monotonic()  # for durations; immune to clock changes
         self.session_active = False  # NEW: Track session state explicitly
+        # Set when self.profile changed in memory since the last save;
+        # the profile is written once at session end (or on shutdown)
+        self._profile_dirty = False
         
         # Log vocabulary manager integration
-        print(f"🎯 Session manager initialized with vocabulary manager")
-        print(f"   User level: {self.profile.get('level', 'unknown')}")
-        print(f"   Known vocabulary: {len(self.profile.get('vocab_summary', {}))}")
+        logger.info("🎯 Session manager initialized with vocabulary manager")
+        logger.info("   User level: %s", self.profile.get('level', 'unknown'))
+        logger.info("   Known vocabulary: %d", len(self.profile.get('vocab_summary', {})))
 
     def start_new_session(self):
-        self.current_session = []
-        self.recent_exercises = []
-        self.session_start_time = datetime.now()
-        self.session_active = True  # NEW: Set session as active
-        print(f"🎬 New session started at {self.session_start_time}")
+        with self._lock:
+            self.current_session = []
+            self._exercise_index = {}
+            self._expected_answers = {}
+            self.recent_exercises.clear()
+            self.session_start_time = datetime.now()
+            self._session_start_monotonic = time.monotonic()
+            self.session_active = True  # NEW: Set session as active
+            logger.info("🎬 New session started at %s", self.session_start_time)
+
+    def save_profile_if_dirty(self):
+        """Write the profile to disk if it changed since the last save."""
+        with self._lock:
+            if self._profile_dirty:
+                save_user_profile(self.profile, "user_profile.json")
+                self._profile_dirty = False
 
     def end_current_session(self):
-        # Check if session is active instead of checking exercise count
-        if not self.session_active:
-            print("❌ No active session to end")
-            return None
+        with self._lock:
+            # Check if session is active instead of checking exercise count
+            if not self.session_active:
+                logger.info("❌ No active session to end")
+                return None
         
-        print(f"🏁 Ending session with {len(self.current_session)} exercises")
+            logger.info("🏁 Ending session with %d exercises", len(self.current_session))
         
-        # Create session log even if no exercises were completed
-        session_log = {
-            "session_id": f"session_{datetime.now().strftime('%Y_%m_%d_%H%M')}",
-            "user_id": self.profile.get("user_id", "user_001"),
-            "date": datetime.now().strftime('%Y-%m-%d'),
-            "duration_minutes": (datetime.now() - self.session_start_time).seconds // 60,
-            "exercises": self.current_session,
-            "summary": None  # Will be filled below
-        }
+            # Take the clock once so session_id and date agree
+            now = datetime.now()
+            duration_minutes = int(time.monotonic() - self._session_start_monotonic) // 60
         
-        # Create summary based on session data
-        if self.current_session:
-            # Normal session with exercises
-            # Calculate summary stats
-            total_exercises = len(self.current_session)
-            correct_count = sum(1 for ex in self.current_session if ex.get('is_correct', False))
-            accuracy_rate = round((correct_count / total_exercises) * 100) if total_exercises > 0 else 0
-            
-            summary = {
-                "total_exercises": total_exercises,
-                "accuracy_rate": accuracy_rate,
-                "duration_minutes": (datetime.now() - self.session_start_time).seconds // 60,
-                "error_categories": [],  # Could be populated with error analysis
-                "session_type": "normal"
+            # Create session log even if no exercises were completed
+            session_log = {
+                "session_id": f"session_{now.strftime('%Y_%m_%d_%H%M')}",
+                "user_id": self.profile.get("user_id", "user_001"),
+                "date": now.strftime('%Y-%m-%d'),
+                "duration_minutes": duration_minutes,
+                "exercises": self.current_session,
+                "summary": None  # Will be filled below
             }
+        
+            # Create summary based on session data
+            if self.current_session:
+                # Normal session with exercises
+                # Calculate summary stats
+                total_exercises = len(self.current_session)
+                # One pass for both the correct count and the error notes
+                # shown on the summary page
+                correct_count = 0
+                error_counts = Counter()
+                for ex in self.current_session:
+                    if ex.get('is_correct', False):
+                        correct_count += 1
+                    # error_analysis is raw LLM output: count only string
+                    # items of a list, so a malformed reply cannot fail
+                    # the session end
+                    errors = ex.get('error_analysis')
+                    if isinstance(errors, list):
+                        error_counts.update(e for e in errors if isinstance(e, str))
+                accuracy_rate = round((correct_count / total_exercises) * 100)
             
-            # Add summary to session log and save it
-            session_log["summary"] = summary
-            log_exercise_to_session(session_log)
+                main_errors = [err for err, _ in error_counts.most_common(3)]
             
-            # Update profile with exercise records
-            update_user_profile(self.profile, self.current_session)
-            save_user_profile(self.profile, "user_profile.json")
-        else:
-            # Empty session - create minimal summary
-            summary = {
-                "total_exercises": 0,
-                "accuracy_rate": 0,
-                "duration_minutes": (datetime.now() - self.session_start_time).seconds // 60,
-                "error_categories": [],
-                "session_type": "empty"
-            }
+                summary = {
+                    "total_exercises": total_exercises,
+                    "accuracy_rate": accuracy_rate,
+                    "duration_minutes": duration_minutes,
+                    "error_categories": [],  # Could be populated with error analysis
+                    "main_errors": main_errors,
+                    "session_type": "normal"
+                }
             
-            # Add summary to session log and save it
-            session_log["summary"] = summary
-            log_exercise_to_session(session_log)
+                # Add summary to session log and save it
+                session_log["summary"] = summary
+                log_exercise_to_session(session_log)
+            
+                # Update profile with exercise records
+                update_user_profile(self.profile, self.current_session)
+                self._profile_dirty = True
+            else:
+                # Empty session - create minimal summary
+                summary = {
+                    "total_exercises": 0,
+                    "accuracy_rate": 0,
+                    "duration_minutes": duration_minutes,
+                    "error_categories": [],
+                    "main_errors": [],
+                    "session_type": "empty"
+                }
+            
+                # Add summary to session log and save it
+                session_log["summary"] = summary
+                log_exercise_to_session(session_log)
+        
+            # One profile write per session, covering every answer in it
+            self.save_profile_if_dirty()
         
-        # Mark session as inactive
-        self.session_active = False
+            # Mark session as inactive
+            self.session_active = False
         
-        print(f"✅ Session completed and profile updated")
-        return summary
+            logger.info("✅ Session completed and profile updated")
+            return summary
 
     # Rest of the methods remain the same...
     def generate_exercise(self, exercise_type="fill_in_blank"):
@@ -140,167 +371,84 @@ class ExerciseSessionManager:
         
         # Validate exercise type
         if not validate_exercise_type(exercise_type):
-            available_info = get_exercise_type_info()
             return {
                 "error": f"Invalid exercise type: {exercise_type}",
-                "available_types": available_info['available_types']
+                "available_types": EXERCISE_TYPE_INFO['available_types']
             }
         
         try:
-            print(f"🎯 Generating {exercise_type} exercise (session exercise #{len(self.current_session) + 1})")
+            logger.info("🎯 Generating %s exercise (session exercise #%d)", exercise_type, len(self.current_session) + 1)
+            
+            # The prompt builders slice this, so hand them a list snapshot
+            with self._lock:
+                recent_exercises = list(self.recent_exercises)
             
             exercise = generate_exercise(
                 profile_path="user_profile.json",
-                recent_exercises=self.recent_exercises,
+                recent_exercises=recent_exercises,
                 exercise_type=exercise_type
             )
 
             if not exercise or exercise.get('error'):
-                print(f"❌ Exercise generation failed: {exercise.get('error', 'Unknown error')}")
+                logger.error("❌ Exercise generation failed: %s", exercise.get('error', 'Unknown error'))
                 return None
 
             exercise_id = str(uuid4())
             exercise["exercise_id"] = exercise_id
-            self.current_session.append(exercise)
+            expected = _EXPECTED_ANSWERS.get(exercise.get('exercise_type'), _expected_text)(exercise)
+            with self._lock:
+                self.current_session.append(exercise)
+                self._exercise_index[exercise_id] = exercise
+                self._expected_answers[exercise_id] = (expected, normalize_answer_for_comparison(expected))
             
             # Build response based on exercise type
-            response = {
-                'exercise_id': exercise_id,
-                'exercise_type': exercise.get('exercise_type'),
-                'prompt': exercise.get('prompt'),
-                'glossary': exercise.get('glossary'),
-                'grammar_focus': exercise.get('grammar_focus', []),
-                'translated_sentence': exercise.get('translated_sentence', '')
-            }
+            response = {'exercise_id': exercise_id}
+            for fields in (_RESPONSE_FIELDS, _RESPONSE_EXTRA_FIELDS.get(exercise_type, ())):
+                for response_key, exercise_key, default in fields:
+                    response[response_key] = exercise.get(exercise_key, default) if exercise_key else default
             
-            # Add type-specific fields
-            if exercise_type == 'multiple_choice':
-                response.update({
-                    'choices': exercise.get('choices', {}),
-                    'explanation': exercise.get('explanation', '')
-                })
-            elif exercise_type == 'error_correction':
-                response.update({
-                    'sentences': exercise.get('sentences', {}),
-                    'instruction': exercise.get('prompt', 'Select the correct sentence')
-                })
-            elif exercise_type == 'sentence_building':
-                response.update({
-                    'word_pieces': exercise.get('word_pieces', []),
-                    'instruction': 'Arrange these words in the correct order'
-                })
-            elif exercise_type in ['fill_in_blank', 'fill_multiple_blanks', 'translation']:
-                response.update({
-                    'expected_answer': exercise.get('expected_answer'),
-                    'filled_sentence': exercise.get('filled_sentence')
-                })
-            
-            print(f"✅ Exercise generated successfully: {exercise.get('prompt', '')[:50]}...")
+            logger.info("✅ Exercise generated successfully: %.50s...", exercise.get('prompt', ''))
             return response
             
         except Exception as e:
-            print(f"❌ Error generating exercise: {e}")
+            logger.error("❌ Error generating exercise: %s", e)
             return {
                 "error": f"Failed to generate exercise: {str(e)}"
             }
 
+    def get_exercise_type(self, exercise_id):
+        """Type of a generated exercise, or None if the ID is unknown."""
+        with self._lock:
+            matching = self._exercise_index.get(exercise_id)
+        return matching.get('exercise_type') if matching else None
+
     def evaluate_exercise(self, exercise_id, user_answer):
-        matching = next((ex for ex in self.current_session if ex['exercise_id'] == exercise_id), None)
+        with self._lock:
+            matching = self._exercise_index.get(exercise_id)
+            expected, normalized_expected = self._expected_answers.get(exercise_id, (None, None))
         if not matching:
-            print(f"❌ Exercise not found: {exercise_id}")
+            logger.warning("❌ Exercise not found: %s", exercise_id)
             return None
         
-        print(f"📝 Evaluating exercise: {matching.get('exercise_type')} - {matching.get('prompt', '')[:50]}...")
-        
         exercise_type = matching.get('exercise_type')
-        expected = matching.get('expected_answer', '')
-        
-        # Handle different exercise types
-        if exercise_type == 'fill_in_blank':
-            # Check if user provided the complete sentence or just the missing word
-            if '___' in matching.get('prompt', ''):
-                expected_complete = matching.get('filled_sentence', '')
-                if user_answer.strip() == expected_complete.strip():
-                    # User provided complete sentence - compare directly
-                    comparison_text = user_answer.strip()
-                    expected = expected_complete.strip()
-                else:
-                    # User provided just the missing word - build sentence and compare
-                    filled = build_filled_sentence(matching.get('prompt', ''), user_answer).strip()
-                    comparison_text = filled
-                    expected = expected_complete.strip()
-            else:
-                # Fallback for prompts without blanks
-                comparison_text = user_answer.strip()
-                expected = str(expected).strip()
-        elif exercise_type == 'fill_multiple_blanks':
-            # Handle array of answers
-            if isinstance(user_answer, str):
-                # If user_answer is a string, try to parse it as comma-separated values
-                user_answer = [ans.strip().replace('"', '').replace("'", '') for ans in user_answer.split(',')]
-            
-            # Check if user provided complete sentence or individual answers
-            expected_complete = matching.get('filled_sentence', '')
-            if isinstance(user_answer, list) and len(user_answer) == 1:
-                # Single string provided, check if it's the complete sentence
-                if user_answer[0].strip() == expected_complete.strip():
-                    comparison_text = user_answer[0].strip()
-                    expected = expected_complete.strip()
-                else:
-                    # Build sentence from the single answer (likely incorrect)
-                    filled = build_filled_sentence(matching.get('prompt', ''), user_answer).strip()
-                    comparison_text = filled
-                    expected = expected_complete.strip()
-            else:
-                # Multiple answers provided - build the sentence
-                filled = build_filled_sentence(matching.get('prompt', ''), user_answer).strip()
-                comparison_text = filled
-                expected = expected_complete.strip()
-        elif exercise_type == 'multiple_choice':
-            # For multiple choice, compare the choice letter (A, B, C, D)
-            comparison_text = user_answer.strip().upper()
-            expected = matching.get('correct_answer', '')
-        elif exercise_type == 'error_correction':
-            # Compare choice letter for error correction
-            comparison_text = user_answer.strip().upper()
-            expected = matching.get('correct_answer', '').strip().upper()
-            
-            # Additional validation - make sure the expected answer is a valid choice
-            if expected not in ['A', 'B', 'C', 'D']:
-                print(f"⚠️ Invalid correct_answer in exercise: {expected}")
-                expected = 'A'  # Fallback, though this shouldn't happen with validation
-            
-            # For error correction, we can also provide the actual sentence text in feedback
-            sentences = matching.get('sentences', {})
-            expected_sentence = sentences.get(expected, '') if expected in sentences else ''
-            
-            # Store the sentence text as well for more detailed feedback
-            matching['expected_sentence_text'] = expected_sentence
-        elif exercise_type == 'sentence_building':
-            # Compare ordered word list
-            if isinstance(user_answer, str):
-                user_answer = user_answer.split()  # Simple split for now
-            comparison_text = ' '.join(user_answer) if isinstance(user_answer, list) else user_answer
-            expected_order = matching.get('expected_answer', [])
-            expected = ' '.join(expected_order) if isinstance(expected_order, list) else str(expected_order)
-        elif exercise_type == 'translation':
-            # Translation exercises handled the same as other text-based exercises
-            comparison_text = user_answer.strip()
-            expected = str(expected).strip()
+        prompt = matching.get('prompt', '')
+        logger.info("📝 Evaluating exercise: %s - %.50s...", exercise_type, prompt)
+        
+        # Turn the answer into text comparable with the expected answer
+        compare = _ANSWER_COMPARERS.get(exercise_type, _compare_text)
+        comparison_text, user_answer = compare(matching, user_answer, expected)
+        if comparison_text == expected:
+            # Identical text normalizes identically; skip the normalizer
+            normalized_comparison = normalized_expected
         else:
-            # Default case for any other exercise types
-            comparison_text = user_answer.strip()
-            expected = str(expected).strip()
-
-        # ✅ NEW: Normalize both answers for comparison (ignore trailing punctuation)
-        normalized_comparison = normalize_answer_for_comparison(comparison_text)
-        normalized_expected = normalize_answer_for_comparison(expected)
+            normalized_comparison = normalize_answer_for_comparison(comparison_text)
+        grammar_focus = matching.get('grammar_focus', [])
         
-        print(f"🔍 Comparison debug:")
-        print(f"   Original user: '{comparison_text}'")
-        print(f"   Normalized user: '{normalized_comparison}'")
-        print(f"   Original expected: '{expected}'")
-        print(f"   Normalized expected: '{normalized_expected}'")
+        logger.debug("🔍 Comparison debug:")
+        logger.debug("   Original user: '%s'", comparison_text)
+        logger.debug("   Normalized user: '%s'", normalized_comparison)
+        logger.debug("   Original expected: '%s'", expected)
+        logger.debug("   Normalized expected: '%s'", normalized_expected)
 
         # Quick exact match check with normalized versions
         if normalized_comparison == normalized_expected:
@@ -308,55 +456,56 @@ class ExerciseSessionManager:
                 'is_correct': True,
                 'corrected_answer': expected,
                 'error_analysis': [],
-                'grammar_focus': matching.get('grammar_focus', []),
+                'grammar_focus': grammar_focus,
                 'explanation_summary': 'Perfect match — no issues detected.'
             }
-            print(f"✅ Correct answer! (normalized match)")
+            logger.info("✅ Correct answer! (normalized match)")
         else:
-            print(f"❌ Incorrect - using LLM evaluation")
-            print(f"   Difference: '{normalized_comparison}' ≠ '{normalized_expected}'")
+            logger.info("❌ Incorrect - using LLM evaluation")
+            logger.debug("   Difference: '%s' ≠ '%s'", normalized_comparison, normalized_expected)
             # Use LLM evaluation for incorrect answers
             feedback = evaluate_answer(
-                prompt=matching.get('prompt', ''),
+                prompt=prompt,
                 user_answer=comparison_text,
                 expected_answer=expected,
-                grammar_focus=matching.get('grammar_focus', []),
+                grammar_focus=grammar_focus,
                 target_language=self.profile.get('target_language', 'Korean')
             )
         
         # Normalize grammar IDs
         feedback['grammar_focus'] = [normalize_grammar_id(g) for g in feedback.get('grammar_focus', [])]
         
-        # Update exercise record
-        matching.update({
-            'is_correct': feedback['is_correct'],
-            'error_analysis': feedback.get('error_analysis', []),
-            'corrected_answer': feedback.get('corrected_answer', '')
-        })
-        
-        # Create history entry
-        history_entry = {
-            'exercise_type': matching.get('exercise_type'),
-            'prompt': matching.get('prompt'),
-            'user_answer': user_answer,
-            'expected_answer': expected,
-            'is_correct': feedback['is_correct']
-        }
+        with self._lock:
+            # Update exercise record
+            matching.update({
+                'is_correct': feedback['is_correct'],
+                'error_analysis': feedback.get('error_analysis', []),
+                'corrected_answer': feedback.get('corrected_answer', '')
+            })
         
-        # Update profile and recent exercises
-        update_user_profile(self.profile, [feedback])
-        self.recent_exercises.append(history_entry)
+            # Create history entry
+            history_entry = {
+                'exercise_type': exercise_type,
+                'prompt': prompt,
+                'user_answer': user_answer,
+                'expected_answer': expected,
+                'is_correct': feedback['is_correct']
+            }
         
-        # Keep only last 10 exercises for prompt context
-        if len(self.recent_exercises) > 10:
-            self.recent_exercises = self.recent_exercises[-10:]
+            # Update profile and recent exercises
+            update_user_profile(self.profile, [feedback])
+            self._profile_dirty = True
+            # Bounded deque: only the last 10 exercises are kept for prompt context
+            self.recent_exercises.append(history_entry)
             
-        print(f"📝 Exercise evaluated. Recent exercises: {len(self.recent_exercises)}")
+        logger.info("📝 Exercise evaluated. Recent exercises: %d", len(self.recent_exercises))
         
         return feedback
 
 manager = ExerciseSessionManager()
 manager.start_new_session()
+# Answers evaluated after the last session end are not lost on shutdown
+atexit.register(manager.save_profile_if_dirty)
 
 # -- UI Routes --
 @app.route('/')
@@ -373,13 +522,13 @@ def serve_curriculum(filename):
 def api_vocab_stats():
     """Get vocabulary database statistics"""
     stats = vocab_manager.get_stats()
-    return jsonify(stats), 200
+    return json_response(stats)
 
 @app.route('/api/vocab/search', methods=['GET'])
 def api_vocab_search():
     """Search vocabulary by query string"""
-    query = request.args.get('q', '')
-    limit = int(request.args.get('limit', 10))
+    query = request.args.get('q', '').strip()
+    limit = request.args.get('limit', 10, type=int)
     
     if not query:
         return jsonify({'error': 'Query parameter "q" is required'}), 400
@@ -387,27 +536,17 @@ def api_vocab_search():
     results = vocab_manager.search_words(query, limit)
     
     # Return detailed results with translations
-    detailed_results = []
-    for word in results:
-        word_data = vocab_manager.get_word_data(word)
-        if word_data:
-            detailed_results.append({
-                'word': word,
-                'translation': word_data.get('translation', ''),
-                'frequency_rank': word_data.get('frequency_rank'),
-                'topik_level': word_data.get('topik_level'),
-                'tags': word_data.get('tags')
-            })
+    detailed_results = vocab_manager.get_word_data_bulk(results)
     
-    return jsonify({'results': detailed_results}), 200
+    return json_response({'results': detailed_results})
 
 @app.route('/api/vocab/suggestions/<level>', methods=['GET'])
 def api_vocab_suggestions(level):
     """Get vocabulary suggestions for a specific level"""
-    limit = int(request.args.get('limit', 10))
+    limit = request.args.get('limit', 10, type=int)
     
     # Get user's known words from profile
-    profile = load_user_profile("user_profile.json")
+    profile = get_cached_profile("user_profile.json")
     known_words = set(profile.get('vocab_summary', {}).keys())
     
     suggestions = vocab_manager.get_words_for_level(
@@ -417,17 +556,7 @@ def api_vocab_suggestions(level):
     )
     
     # Return detailed suggestions
-    detailed_suggestions = []
-    for word in suggestions:
-        word_data = vocab_manager.get_word_data(word)
-        if word_data:
-            detailed_suggestions.append({
-                'word': word,
-                'translation': word_data.get('translation', ''),
-                'frequency_rank': word_data.get('frequency_rank'),
-                'topik_level': word_data.get('topik_level'),
-                'tags': word_data.get('tags')
-            })
+    detailed_suggestions = vocab_manager.get_word_data_bulk(suggestions)
     
     return jsonify({'suggestions': detailed_suggestions}), 200
 
@@ -440,19 +569,21 @@ def api_start_session():
 @app.route('/api/exercise/new', methods=['POST'])
 def api_new_exercise():
     """Enhanced exercise generation with difficulty progression support"""
-    data = request.get_json()
+    data = get_json_body() or {}
     exercise_type = data.get("exercise_type", "auto")  # Default to auto
+    if not isinstance(exercise_type, str):
+        return jsonify({'error': 'exercise_type must be a string.'}), 400
     
     # If auto is selected, let the difficulty system choose
     if exercise_type == "auto":
-        print("🤖 Using automatic exercise type selection based on difficulty progression")
+        logger.info("🤖 Using automatic exercise type selection based on difficulty progression")
     else:
-        print(f"👤 User manually selected: {exercise_type}")
+        logger.info("👤 User manually selected: %s", exercise_type)
     
     exercise = manager.generate_exercise(exercise_type=exercise_type)
     
     if exercise and not exercise.get('error'):
-        return jsonify({'exercise': exercise}), 200
+        return json_response({'exercise': exercise})
     elif exercise and exercise.get('error'):
         return jsonify({'error': exercise['error']}), 400
     else:
@@ -460,29 +591,42 @@ def api_new_exercise():
 
 @app.route('/api/exercise/answer', methods=['POST'])
 def api_answer_exercise():
-    data = request.get_json()
+    data = get_json_body()
+    if data is None:
+        return jsonify({'error': 'Request body must be a JSON object.'}), 400
     exercise_id = data.get('exercise_id')
     user_answer = data.get('user_answer')
     
     if not exercise_id or user_answer is None:
         return jsonify({'error': 'Missing exercise_id or user_answer.'}), 400
+    if not isinstance(exercise_id, str):
+        return jsonify({'error': 'exercise_id must be a string.'}), 400
+    if not isinstance(user_answer, (str, list)) or (
+            isinstance(user_answer, list) and not all(isinstance(a, str) for a in user_answer)):
+        return jsonify({'error': 'user_answer must be a string or a list of strings.'}), 400
+    if isinstance(user_answer, list):
+        exercise_type = manager.get_exercise_type(exercise_id)
+        if exercise_type is None:
+            return jsonify({'error': 'Exercise ID not found.'}), 404
+        if exercise_type not in _LIST_ANSWER_TYPES:
+            return jsonify({'error': f'user_answer must be a string for {exercise_type} exercises.'}), 400
     
     feedback = manager.evaluate_exercise(exercise_id, user_answer)
     if feedback:
-        return jsonify({'feedback': feedback}), 200
+        return json_response({'feedback': feedback})
     return jsonify({'error': 'Exercise ID not found.'}), 404
 
 @app.route('/api/session/end', methods=['POST'])
 def api_end_session():
     try:
-        print("🔚 API: Attempting to end session...")
+        logger.info("🔚 API: Attempting to end session...")
         summary = manager.end_current_session()
-        print(f"🔚 API: End session returned: {summary}")
+        logger.debug("🔚 API: End session returned: %s", summary)
         
         if summary is not None:
             # Session ended successfully (even if it was empty)
             session_type = summary.get('session_type', 'normal')
-            print(f"🔚 API: Session type: {session_type}")
+            logger.info("🔚 API: Session type: %s", session_type)
             
             if session_type == 'empty':
                 return jsonify({
@@ -493,12 +637,11 @@ def api_end_session():
                 return jsonify({'summary': summary}), 200
         else:
             # No active session
-            print("🔚 API: No active session detected")
+            logger.info("🔚 API: No active session detected")
             return jsonify({'error': 'No active session to end.'}), 400
             
     except Exception as e:
-        print(f"❌ API: Error ending session: {e}")
-        import traceback
+        logger.error("❌ API: Error ending session: %s", e)
         traceback.print_exc()
         return jsonify({'error': f'Failed to end session: {str(e)}'}), 500
 
@@ -506,52 +649,77 @@ def api_end_session():
 @app.route('/api/exercise/types', methods=['GET'])
 def api_get_exercise_types():
     """Get information about available exercise types"""
-    return jsonify(get_exercise_type_info()), 200
+    return Response(EXERCISE_TYPE_INFO_JSON, mimetype='application/json')
 
 # -- Configuration & Metadata --
+CONFIG_FILE = 'config.json'
+_config_cache = None  # (mtime_ns, parsed config)
+_config_lock = threading.Lock()
+
+def load_config():
+    """Parsed config.json, re-read only when the file changed on disk. Call with _config_lock held."""
+    global _config_cache
+    mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    if _config_cache is None or _config_cache[0] != mtime:
+        _config_cache = (mtime, load_file(CONFIG_FILE))
+    return _config_cache[1]
+
 @app.route('/api/config/update', methods=['POST'])
 def update_config():
-    data = request.get_json()
-    with open('config.json', 'r', encoding='utf-8') as f:
-        config = json.load(f)
-    provider = data.get('provider', config.get('default_provider'))
-    config['default_provider'] = provider
-    if provider == 'openai':
-        config['openai_model'] = data.get('model', config.get('openai_model'))
-    elif provider == 'local':
-        config['local_port'] = int(data.get('port', config.get('local_port')))
-        config['local_model'] = data.get('model', config.get('local_model'))
-    with open('config.json', 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    global _config_cache
+    data = get_json_body()
+    if data is None:
+        return jsonify({'error': 'Request body must be a JSON object.'}), 400
+    with _config_lock:
+        # Edit a copy so a failed write leaves the cached config untouched
+        current = load_config()
+        config = dict(current)
+        provider = data.get('provider', config.get('default_provider'))
+        config['default_provider'] = provider
+        if provider == 'openai':
+            config['openai_model'] = data.get('model', config.get('openai_model'))
+        elif provider == 'local':
+            config['local_port'] = int(data.get('port', config.get('local_port')))
+            config['local_model'] = data.get('model', config.get('local_model'))
+        if config == current:
+            # Re-saving the same settings from the UI needs no write
+            return jsonify({'message': 'No changes.'}), 200
+        replace_file(CONFIG_FILE, config)
+        _config_cache = (os.stat(CONFIG_FILE).st_mtime_ns, config)
     return jsonify({'message': 'Configuration updated successfully.'}), 200
 
 # -- Session Summary & History --
 @app.route('/api/session/summary', methods=['GET'])
 def get_session_summary():
+    etag = latest_session_version()
+    cached = not_modified(etag)
+    if cached:
+        return cached
     summary = load_latest_session_summary()
     if not summary:
         return jsonify({'error': 'No session summary available.'}), 404
-    return jsonify({'summary': summary}), 200
+    return with_etag(jsonify({'summary': summary}), etag), 200
 
 @app.route('/api/session/history', methods=['GET'])
 def get_session_history():
-    try:
-        files = [f for f in os.listdir(SESSION_LOGS_DIR) if f.endswith('.json')]
-    except FileNotFoundError:
-        return jsonify({'sessions': []}), 200
-    sessions = []
-    for file in sorted(files, reverse=True):
-        with open(os.path.join(SESSION_LOGS_DIR, file), 'r', encoding='utf-8') as f:
-            session_log = json.load(f)
-            summary = session_log.get('summary')
-            if summary:
-                sessions.append({
-                    'session_id': session_log.get('session_id', file),
-                    'date': session_log.get('date', 'Unknown Date'),
-                    'total_exercises': summary.get('total_exercises', 0),
-                    'accuracy_rate': summary.get('accuracy_rate', 0.0)
-                })
-    return jsonify({'sessions': sessions}), 200
+    limit = request.args.get('limit', type=int)
+    version = session_index_version()
+    etag = f"{version}-{limit}" if version else None
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    def generate():
+        # Write rows out as they are decoded instead of building the full
+        # list; each row carries its separator so it goes out as one chunk
+        opening = b'{"sessions":['
+        sep = opening
+        for entry in iter_session_index(limit):
+            yield sep + dumps(entry)
+            sep = b','
+        yield (opening if sep is opening else b'') + b']}'
+
+    return with_etag(Response(generate(), mimetype='application/json'), etag), 200
 
 # -- Vocabulary Management Endpoints --
 @app.route('/api/vocab/reload', methods=['POST'])
@@ -598,25 +766,18 @@ def api_debug_vocab_manager():
 def api_get_difficulty_info():
     """Get difficulty progression information for all grammar points"""
     try:
-        from engine.difficulty_system import DifficultyProgressionManager
+        profile = get_cached_profile("user_profile.json")
         
-        profile = load_user_profile("user_profile.json")
-        manager = DifficultyProgressionManager()
-        
-        # Get all grammar points with difficulty info
+        # Get all grammar points with difficulty info, collecting the
+        # overall statistics in the same pass
         grammar_summary = profile.get('grammar_summary', {})
         difficulty_info = {}
-        
-        for grammar_id in grammar_summary.keys():
-            summary = manager.get_difficulty_summary(profile, grammar_id)
-            difficulty_info[grammar_id] = summary
-        
-        # Overall statistics
-        total_grammar = len(grammar_summary)
         unlocked_difficulties = set()
         mastered_difficulties = set()
         
-        for grammar_id, info in difficulty_info.items():
+        for grammar_id in grammar_summary:
+            info = difficulty_manager.get_difficulty_summary(profile, grammar_id)
+            difficulty_info[grammar_id] = info
             for diff_name, mastery in info['mastery_by_difficulty'].items():
                 if mastery['reps'] > 0:  # Has been attempted
                     unlocked_difficulties.add(diff_name)
@@ -626,7 +787,7 @@ def api_get_difficulty_info():
         return jsonify({
             'grammar_difficulty_details': difficulty_info,
             'overall_stats': {
-                'total_grammar_points': total_grammar,
+                'total_grammar_points': len(grammar_summary),
                 'unlocked_difficulty_types': list(unlocked_difficulties),
                 'mastered_difficulty_types': list(mastered_difficulties),
                 'progression_percentage': len(mastered_difficulties) / 4 * 100 if unlocked_difficulties else 0
@@ -635,14 +796,24 @@ def api_get_difficulty_info():
     except Exception as e:
         return jsonify({'error': f'Failed to get difficulty info: {str(e)}'}), 500
 
+# (profile, date, serialized body) of the last progression summary. The
+# summary depends on the profile and on today's date (can_unlock_next
+# waits a day after mastery). get_cached_profile returns the same dict
+# until user_profile.json changes, so dashboard polls on the same day
+# in between are served the stored bytes.
+_progression_cache = None
+
 @app.route('/api/difficulty/progression', methods=['GET'])
 def api_get_progression_summary():
     """Get comprehensive progression summary including difficulty mastery"""
+    global _progression_cache
     try:
-        from engine.difficulty_system import DifficultyProgressionManager
+        profile = get_cached_profile("user_profile.json")
+        today = date.today()
+        cached = _progression_cache
+        if cached is not None and cached[0] is profile and cached[1] == today:
+            return Response(cached[2], mimetype='application/json')
         
-        profile = load_user_profile("user_profile.json")
-        manager = DifficultyProgressionManager()
         grammar_summary = profile.get('grammar_summary', {})
         
         # Traditional mastery stats
@@ -650,8 +821,19 @@ def api_get_progression_summary():
             "new": 0, "learning": 0, "reviewing": 0, "mastered": 0
         }
         
-        # Count traditional mastery levels
-        for gid, data in grammar_summary.items():
+        # Difficulty progression stats
+        difficulty_progression = {}
+        difficulty_totals = {
+            'RECOGNITION': {'mastered': 0, 'attempted': 0},
+            'GUIDED_PRODUCTION': {'mastered': 0, 'attempted': 0},
+            'STRUCTURED_PRODUCTION': {'mastered': 0, 'attempted': 0},
+            'FREE_PRODUCTION': {'mastered': 0, 'attempted': 0}
+        }
+        recommendations = []
+        
+        # One pass over the grammar points fills all three
+        for grammar_id, data in grammar_summary.items():
+            # Count traditional mastery levels
             reps = data.get('reps', 0)
             exposures = data.get('exposure', 0)
             consecutive_correct = data.get('consecutive_correct', 0)
@@ -666,61 +848,49 @@ def api_get_progression_summary():
                 traditional_stats["reviewing"] += 1
             else:
                 traditional_stats["mastered"] += 1
-        
-        # Difficulty progression stats
-        difficulty_progression = {}
-        difficulty_totals = {
-            'RECOGNITION': {'mastered': 0, 'attempted': 0},
-            'GUIDED_PRODUCTION': {'mastered': 0, 'attempted': 0},
-            'STRUCTURED_PRODUCTION': {'mastered': 0, 'attempted': 0},
-            'FREE_PRODUCTION': {'mastered': 0, 'attempted': 0}
-        }
-        
-        for grammar_id in grammar_summary.keys():
-            progress_summary = manager.get_difficulty_summary(profile, grammar_id)
-            difficulty_progression[grammar_id] = progress_summary
+            
+            progress = difficulty_manager.get_difficulty_summary(profile, grammar_id)
+            difficulty_progression[grammar_id] = progress
+            mastery_by_difficulty = progress['mastery_by_difficulty']
             
             # Aggregate stats
-            for diff_name, mastery_info in progress_summary['mastery_by_difficulty'].items():
+            for diff_name, mastery_info in mastery_by_difficulty.items():
                 if mastery_info['reps'] > 0:
-                    difficulty_totals[diff_name]['attempted'] += 1
+                    totals = difficulty_totals[diff_name]
+                    totals['attempted'] += 1
                     if mastery_info['is_mastered']:
-                        difficulty_totals[diff_name]['mastered'] += 1
-        
-        # Calculate progression percentages
-        progression_percentages = {}
-        for diff_name, stats in difficulty_totals.items():
-            if stats['attempted'] > 0:
-                progression_percentages[diff_name] = (stats['mastered'] / stats['attempted']) * 100
-            else:
-                progression_percentages[diff_name] = 0
-        
-        # Get recommendations
-        recommendations = []
-        for grammar_id, progress in difficulty_progression.items():
-            current_max = progress['current_max_difficulty']
-            can_unlock = progress['can_unlock_next']
+                        totals['mastered'] += 1
             
-            if can_unlock:
+            # Get recommendations
+            if progress['can_unlock_next']:
                 recommendations.append({
                     'grammar_id': grammar_id,
-                    'current_level': current_max,
+                    'current_level': progress['current_max_difficulty'],
                     'recommendation': 'Ready to unlock next difficulty level',
                     'priority': 'high'
                 })
             else:
                 # Find the lowest unmastered difficulty
-                for diff_name, mastery in progress['mastery_by_difficulty'].items():
-                    if mastery['reps'] > 0 and not mastery['is_mastered']:
-                        recommendations.append({
-                            'grammar_id': grammar_id,
-                            'current_level': diff_name,
-                            'recommendation': f'Continue practicing {diff_name.lower()}',
-                            'priority': 'medium'
-                        })
-                        break
+                diff_name = next(
+                    (name for name, mastery in mastery_by_difficulty.items()
+                     if mastery['reps'] > 0 and not mastery['is_mastered']),
+                    None
+                )
+                if diff_name is not None:
+                    recommendations.append({
+                        'grammar_id': grammar_id,
+                        'current_level': diff_name,
+                        'recommendation': f'Continue practicing {diff_name.lower()}',
+                        'priority': 'medium'
+                    })
         
-        return jsonify({
+        # Calculate progression percentages
+        progression_percentages = {
+            diff_name: (stats['mastered'] / stats['attempted']) * 100 if stats['attempted'] else 0
+            for diff_name, stats in difficulty_totals.items()
+        }
+        
+        body = dumps({
             'traditional_mastery': traditional_stats,
             'difficulty_mastery_totals': difficulty_totals,
             'difficulty_progression_percentages': progression_percentages,
@@ -730,9 +900,10 @@ def api_get_progression_summary():
                 'total_grammar_points': len(grammar_summary),
                 'progression_percentage': sum(progression_percentages.values()) / 4 if progression_percentages else 0
             }
-        }), 200
+        })
+        _progression_cache = (profile, today, body)
+        return Response(body, mimetype='application/json')
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({'error': f'Failed to get progression summary: {str(e)}'}), 500
 
@@ -740,10 +911,7 @@ def api_get_progression_summary():
 def api_get_recommended_exercise():
     """Get the recommended exercise type based on difficulty progression"""
     try:
-        from engine.planner import select_review_and_new_items
-        from engine.utils import normalize_grammar_id
-        
-        profile = load_user_profile("user_profile.json")
+        profile = get_cached_profile("user_profile.json")
         selections = select_review_and_new_items(profile_path="user_profile.json")
         
         grammar_targets = [normalize_grammar_id(g) for g in
@@ -787,4 +955,6 @@ if __name__ == '__main__':
     print(f"   - Frequency data: {vocab_stats.get('frequency_coverage', 'N/A')}")
     print()
     
-    app.run(host='0.0.0.0', port=8000, debug=True)
+    # FLASK_DEBUG=0 turns off the reloader and debugger, e.g. for local load testing
+    debug = os.environ.get('FLASK_DEBUG', '1') != '0'
+    app.run(host='0.0.0.0', port=8000, debug=debug, threaded=True)
@@ -1,19 +1,54 @@
-import json
 import os
+import threading
+
+from engine.json_utils import load_file
 
 CURRICULUM_DIR = os.path.join(os.path.dirname(__file__), "..", "curriculum")
 
+# Parsed curricula keyed by language -> (mtime_ns, curriculum, level index)
+_CURRICULUM_CACHE = {}
+_CURRICULUM_CACHE_LOCK = threading.Lock()
+
+def _cached_curriculum(language):
+    """(mtime_ns, curriculum, level index) for a language, re-read when the file changed."""
+    filename = os.path.join(CURRICULUM_DIR, f"{language}.json")
+    try:
+        mtime = os.stat(filename).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Curriculum file not found: {filename}") from None
+
+    with _CURRICULUM_CACHE_LOCK:
+        cached = _CURRICULUM_CACHE.get(language)
+        if cached is None or cached[0] != mtime:
+            curriculum = load_file(filename)
+            cached = (mtime, curriculum, build_level_index(curriculum))
+            _CURRICULUM_CACHE[language] = cached
+        return cached
+
 def load_curriculum(language="korean"):
     """
     Load the grammar curriculum for a specific language.
     Default is Korean.
+
+    The parsed file is cached and only re-read when its mtime changes;
+    the returned dict is shared between callers - treat it as read-only.
     """
-    filename = os.path.join(CURRICULUM_DIR, f"{language}.json")
-    if not os.path.exists(filename):
-        raise FileNotFoundError(f"Curriculum file not found: {filename}")
+    return _cached_curriculum(language)[1]
+
+def get_level_index(language="korean"):
+    """
+    Grammar points of a language's curriculum grouped by level:
+    {level: [grammar point, ...]}. Cached along with the curriculum;
+    the returned dict is shared between callers - treat it as read-only.
+    """
+    return _cached_curriculum(language)[2]
 
-    with open(filename, "r", encoding="utf-8") as f:
-        return json.load(f)
+def build_level_index(curriculum):
+    """Group the flat grammar_points list by level: {level: [grammar point, ...]}"""
+    index = {}
+    for gp in curriculum.get("grammar_points", []):
+        index.setdefault(gp.get("level"), []).append(gp)
+    return index
 
 def get_grammar_points_by_level(curriculum, level="beginner"):
     # 🚨 NEW: Match flat grammar_points structure
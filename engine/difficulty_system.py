@@ -15,7 +15,7 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 import json
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 
 class ExerciseDifficulty(Enum):
     """Exercise difficulty levels in ascending order"""
@@ -27,28 +27,50 @@ class ExerciseDifficulty(Enum):
     @classmethod
     def from_exercise_type(cls, exercise_type: str) -> 'ExerciseDifficulty':
         """Map exercise types to difficulty levels"""
-        mapping = {
-            'multiple_choice': cls.RECOGNITION,
-            'error_correction': cls.RECOGNITION,
-            'fill_in_blank': cls.GUIDED_PRODUCTION,
-            'fill_multiple_blanks': cls.STRUCTURED_PRODUCTION,
-            'sentence_building': cls.STRUCTURED_PRODUCTION,
-            'translation': cls.FREE_PRODUCTION
-        }
-        return mapping.get(exercise_type, cls.GUIDED_PRODUCTION)
+        return _EXERCISE_TYPE_TO_DIFFICULTY.get(exercise_type, cls.GUIDED_PRODUCTION)
 
-    def get_exercise_types(self) -> List[str]:
+    def get_exercise_types(self) -> Tuple[str, ...]:
         """Get exercise types for this difficulty level"""
-        mapping = {
-            self.RECOGNITION: ['multiple_choice', 'error_correction'],
-            self.GUIDED_PRODUCTION: ['fill_in_blank'],
-            self.STRUCTURED_PRODUCTION: ['fill_multiple_blanks', 'sentence_building'],
-            self.FREE_PRODUCTION: ['translation']
-        }
-        return mapping[self]
+        return _DIFFICULTY_TO_EXERCISE_TYPES[self]
+
+
+# Number of latest results recent_accuracy is computed over
+RECENT_WINDOW = 8
+RECENT_RESULTS_BITS = (1 << RECENT_WINDOW) - 1
+
+
+def _legacy_recent_mask(srs_data: dict) -> int:
+    """
+    Rebuild a recent-results mask for an entry saved before the mask existed.
+    
+    Such entries only stored recent_accuracy as the current streak over
+    min(total_attempts, RECENT_WINDOW), so the window is seeded with that
+    many results, the streak as the newest correct ones and the rest as
+    misses. The mask then gives back the stored recent_accuracy.
+    """
+    recorded = min(srs_data.get('total_attempts', 0), RECENT_WINDOW)
+    streak = min(srs_data.get('consecutive_correct', 0), recorded)
+    return (1 << recorded) | ((1 << streak) - 1)
+
+# Built once; the enum methods above only look them up
+_EXERCISE_TYPE_TO_DIFFICULTY = {
+    'multiple_choice': ExerciseDifficulty.RECOGNITION,
+    'error_correction': ExerciseDifficulty.RECOGNITION,
+    'fill_in_blank': ExerciseDifficulty.GUIDED_PRODUCTION,
+    'fill_multiple_blanks': ExerciseDifficulty.STRUCTURED_PRODUCTION,
+    'sentence_building': ExerciseDifficulty.STRUCTURED_PRODUCTION,
+    'translation': ExerciseDifficulty.FREE_PRODUCTION
+}
 
+_DIFFICULTY_TO_EXERCISE_TYPES = {
+    ExerciseDifficulty.RECOGNITION: ('multiple_choice', 'error_correction'),
+    ExerciseDifficulty.GUIDED_PRODUCTION: ('fill_in_blank',),
+    ExerciseDifficulty.STRUCTURED_PRODUCTION: ('fill_multiple_blanks', 'sentence_building'),
+    ExerciseDifficulty.FREE_PRODUCTION: ('translation',)
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class GrammarDifficultyProgress:
     """Track difficulty progression for a specific grammar point"""
     grammar_id: str
@@ -84,38 +106,40 @@ class DifficultyProgressionManager:
         # Check if we have difficulty tracking data
         difficulty_data = profile.get('grammar_difficulty_progress', {}).get(grammar_id)
         
-        if difficulty_data:
-            # Convert stored data back to progress object
-            progress = GrammarDifficultyProgress(
+        if not difficulty_data:
+            # Most grammar points have no difficulty data yet: start at
+            # recognition level without any enum conversion
+            return GrammarDifficultyProgress(
                 grammar_id=grammar_id,
-                current_max_difficulty=ExerciseDifficulty(difficulty_data['current_max_difficulty']),
-                unlocked_difficulties=[ExerciseDifficulty(d) for d in difficulty_data['unlocked_difficulties']]
+                difficulty_mastery={},
+                unlocked_difficulties=[ExerciseDifficulty.RECOGNITION]
             )
-            
-            # Reconstruct difficulty mastery data
-            for diff_level, srs_data in difficulty_data.get('difficulty_mastery', {}).items():
-                progress.difficulty_mastery[ExerciseDifficulty(int(diff_level))] = srs_data
-                
-            return progress
-        else:
-            # Create new progress starting at recognition level
-            return GrammarDifficultyProgress(grammar_id=grammar_id)
+        
+        # Convert stored data back to progress object, reconstructing the
+        # difficulty mastery data in the same step
+        return GrammarDifficultyProgress(
+            grammar_id=grammar_id,
+            difficulty_mastery={
+                ExerciseDifficulty(int(diff_level)): srs_data
+                for diff_level, srs_data in difficulty_data.get('difficulty_mastery', {}).items()
+            },
+            current_max_difficulty=ExerciseDifficulty(difficulty_data['current_max_difficulty']),
+            unlocked_difficulties=[ExerciseDifficulty(d) for d in difficulty_data['unlocked_difficulties']]
+        )
     
     def is_difficulty_mastered(self, srs_data: dict) -> bool:
         """Check if a difficulty level is mastered for a grammar point"""
         if not srs_data:
             return False
-            
-        reps = srs_data.get('reps', 0)
-        accuracy = srs_data.get('recent_accuracy', 0.0)
-        consecutive = srs_data.get('consecutive_correct', 0)
-        attempts = srs_data.get('total_attempts', 0)
         
+        # Each field is only read if the checks before it passed; most
+        # difficulties fail on the first one or two
+        thresholds = self.mastery_thresholds
         return (
-            reps >= self.mastery_thresholds['min_reps'] and
-            accuracy >= self.mastery_thresholds['min_accuracy'] and
-            consecutive >= self.mastery_thresholds['min_consecutive'] and
-            attempts >= self.mastery_thresholds['min_total_attempts']
+            srs_data.get('reps', 0) >= thresholds['min_reps'] and
+            srs_data.get('recent_accuracy', 0.0) >= thresholds['min_accuracy'] and
+            srs_data.get('consecutive_correct', 0) >= thresholds['min_consecutive'] and
+            srs_data.get('total_attempts', 0) >= thresholds['min_total_attempts']
         )
     
     def can_unlock_next_difficulty(self, progress: GrammarDifficultyProgress) -> bool:
@@ -133,12 +157,12 @@ class DifficultyProgressionManager:
         if not self.is_difficulty_mastered(current_srs_data):
             return False
         
-        # Check if enough time has passed since mastery
+        # Check if enough time has passed since mastery. Stored dates are
+        # ISO 'YYYY-MM-DD' strings, which order the same way as the dates
         last_mastered = current_srs_data.get('mastery_date')
         if last_mastered:
-            mastery_date = datetime.fromisoformat(last_mastered).date()
-            days_since_mastery = (datetime.now().date() - mastery_date).days
-            if days_since_mastery < self.unlock_delay_days:
+            unlock_cutoff = (date.today() - timedelta(days=self.unlock_delay_days)).isoformat()
+            if last_mastered > unlock_cutoff:
                 return False
         
         return True
@@ -168,7 +192,8 @@ class DifficultyProgressionManager:
         if preferred_difficulty and preferred_difficulty in progress.unlocked_difficulties:
             return preferred_difficulty
         
-        # Find the best difficulty to practice
+        # Find the best difficulty to practice (ISO dates compare as strings)
+        today_iso = date.today().isoformat()
         for difficulty in reversed(progress.unlocked_difficulties):
             srs_data = progress.difficulty_mastery.get(difficulty, {})
             
@@ -178,10 +203,8 @@ class DifficultyProgressionManager:
             
             # Check if it's due for review
             next_review = srs_data.get('next_review_date')
-            if next_review:
-                review_date = datetime.fromisoformat(next_review).date()
-                if review_date <= datetime.now().date():
-                    return difficulty
+            if next_review and next_review <= today_iso:
+                return difficulty
         
         # Default to current max difficulty for maintenance
         return progress.current_max_difficulty
@@ -205,8 +228,17 @@ class DifficultyProgressionManager:
                                  exercise_type: str, is_correct: bool) -> dict:
         """Update difficulty progress after an exercise attempt"""
         
-        difficulty = ExerciseDifficulty.from_exercise_type(exercise_type)
         progress = self.get_grammar_difficulty_progress(profile, grammar_id)
+        self._record_attempt(progress, exercise_type, is_correct, date.today())
+        self._store_progress(profile, progress)
+        
+        return profile
+    
+    def _record_attempt(self, progress: GrammarDifficultyProgress, exercise_type: str,
+                        is_correct: bool, today: date) -> None:
+        """Apply one exercise attempt to a progress object in memory"""
+        difficulty = ExerciseDifficulty.from_exercise_type(exercise_type)
+        today_iso = today.isoformat()
         
         # Initialize SRS data for this difficulty if needed
         if difficulty not in progress.difficulty_mastery:
@@ -218,32 +250,61 @@ class DifficultyProgressionManager:
                 'consecutive_correct': 0,
                 'total_attempts': 0,
                 'recent_accuracy': 0.0,
-                'first_seen': datetime.now().date().isoformat(),
-                'last_reviewed': datetime.now().date().isoformat()
+                'first_seen': today_iso,
+                'last_reviewed': today_iso
             }
         
         # Update SRS data (reuse existing SM-2 logic)
         srs_data = progress.difficulty_mastery[difficulty]
-        self._apply_sm2_difficulty(srs_data, is_correct)
+        self._apply_sm2_difficulty(srs_data, is_correct, today)
         
         # Mark mastery date if just achieved
         if is_correct and self.is_difficulty_mastered(srs_data) and 'mastery_date' not in srs_data:
-            srs_data['mastery_date'] = datetime.now().date().isoformat()
-        
-        # Save progress back to profile
-        profile.setdefault('grammar_difficulty_progress', {})[grammar_id] = {
-            'current_max_difficulty': progress.current_max_difficulty.value,
-            'unlocked_difficulties': [d.value for d in progress.unlocked_difficulties],
-            'difficulty_mastery': {
-                str(d.value): data for d, data in progress.difficulty_mastery.items()
+            srs_data['mastery_date'] = today_iso
+    
+    def _store_progress(self, profile: dict, progress: GrammarDifficultyProgress) -> None:
+        """Save a progress object back to the profile"""
+        all_progress = profile.setdefault('grammar_difficulty_progress', {})
+        stored = all_progress.get(progress.grammar_id)
+        if not stored:
+            all_progress[progress.grammar_id] = {
+                'current_max_difficulty': progress.current_max_difficulty.value,
+                'unlocked_difficulties': [d.value for d in progress.unlocked_difficulties],
+                'difficulty_mastery': {
+                    str(d.value): data for d, data in progress.difficulty_mastery.items()
+                }
             }
-        }
-        
-        return profile
+            return
+        
+        # Update the stored entry in place. The SRS dicts in
+        # progress.difficulty_mastery are the stored ones (see
+        # get_grammar_difficulty_progress), so only newly practiced
+        # difficulties have to be added.
+        stored['current_max_difficulty'] = progress.current_max_difficulty.value
+        stored['unlocked_difficulties'] = [d.value for d in progress.unlocked_difficulties]
+        stored_mastery = stored.setdefault('difficulty_mastery', {})
+        for d, data in progress.difficulty_mastery.items():
+            key = str(d.value)
+            if stored_mastery.get(key) is not data:
+                stored_mastery[key] = data
     
-    def _apply_sm2_difficulty(self, srs_data: dict, correct: bool) -> None:
+    def _apply_sm2_difficulty(self, srs_data: dict, correct: bool, today: Optional[date] = None) -> None:
         """Apply SM-2 algorithm specifically for difficulty progression"""
+        if today is None:
+            today = date.today()
         # This is a simplified version - you could reuse your existing SM-2 implementation
+        
+        # Last RECENT_WINDOW results as bits (1 = correct, newest lowest)
+        # under a leading sentinel bit, so the number of recorded results
+        # is bit_length() - 1.
+        mask = srs_data.get('recent_mask')
+        if mask is None:
+            mask = _legacy_recent_mask(srs_data)
+        mask = (mask << 1) | int(correct)
+        if mask.bit_length() - 1 > RECENT_WINDOW:
+            mask = (mask & RECENT_RESULTS_BITS) | (1 << RECENT_WINDOW)
+        srs_data['recent_mask'] = mask
+        
         srs_data['total_attempts'] += 1
         
         if correct:
@@ -253,19 +314,23 @@ class DifficultyProgressionManager:
             srs_data['consecutive_correct'] = 0
             srs_data['lapses'] += 1
         
-        # Calculate recent accuracy
-        total_attempts = srs_data['total_attempts']
-        if total_attempts > 0:
-            recent_window = min(total_attempts, 8)
-            srs_data['recent_accuracy'] = min(1.0, srs_data['consecutive_correct'] / recent_window)
+        # Recent accuracy: share of correct answers among the recorded results
+        recorded = mask.bit_length() - 1
+        srs_data['recent_accuracy'] = (mask.bit_count() - 1) / recorded
         
         # Set next review date (simplified)
         interval = max(1, srs_data['reps'])
-        srs_data['next_review_date'] = (datetime.now().date() + timedelta(days=interval)).isoformat()
-        srs_data['last_reviewed'] = datetime.now().date().isoformat()
+        srs_data['next_review_date'] = (today + timedelta(days=interval)).isoformat()
+        srs_data['last_reviewed'] = today.isoformat()
     
-    def get_difficulty_summary(self, profile: dict, grammar_id: str) -> dict:
-        """Get a summary of difficulty progression for a grammar point"""
+    def get_difficulty_summary(self, profile: dict, grammar_id: str, full: bool = False) -> dict:
+        """
+        Get a summary of difficulty progression for a grammar point.
+        
+        mastery_by_difficulty only lists difficulties that have SRS data,
+        in ascending order; pass full=True to also get zeroed entries for
+        the difficulties never practiced.
+        """
         progress = self.get_grammar_difficulty_progress(profile, grammar_id)
         
         summary = {
@@ -285,7 +350,7 @@ class DifficultyProgressionManager:
                     'accuracy': srs_data.get('recent_accuracy', 0.0),
                     'consecutive_correct': srs_data.get('consecutive_correct', 0)
                 }
-            else:
+            elif full:
                 summary['mastery_by_difficulty'][difficulty.name] = {
                     'is_mastered': False,
                     'reps': 0,
@@ -296,6 +361,15 @@ class DifficultyProgressionManager:
         return summary
 
 
+# Global instance - the manager holds no per-profile state, so one is shared
+difficulty_manager = DifficultyProgressionManager()
+
+
+def get_difficulty_manager() -> DifficultyProgressionManager:
+    """Get the global difficulty progression manager instance"""
+    return difficulty_manager
+
+
 # Integration functions for existing system
 
 def integrate_with_exercise_generator(profile: dict, grammar_targets: list, 
@@ -305,17 +379,20 @@ def integrate_with_exercise_generator(profile: dict, grammar_targets: list,
     Returns the recommended exercise type and difficulty level.
     """
     
-    manager = DifficultyProgressionManager()
+    manager = difficulty_manager
     
     # Find the grammar point that needs the most attention
     target_grammar = None
     target_difficulty = None
+    first_difficulty = None
     
     for grammar_id in grammar_targets:
         progress = manager.get_grammar_difficulty_progress(profile, grammar_id)
         
         # Select appropriate difficulty for this grammar
         difficulty = manager.select_appropriate_difficulty(progress)
+        if first_difficulty is None:
+            first_difficulty = difficulty
         
         # If this is a struggling grammar point, prioritize it
         current_srs = progress.difficulty_mastery.get(difficulty, {})
@@ -324,11 +401,11 @@ def integrate_with_exercise_generator(profile: dict, grammar_targets: list,
             target_difficulty = difficulty
             break
     
-    # If no struggling grammar, use the first one
+    # If no struggling grammar, use the first one (its difficulty was
+    # already selected in the loop above)
     if target_grammar is None and grammar_targets:
         target_grammar = grammar_targets[0]
-        progress = manager.get_grammar_difficulty_progress(profile, target_grammar)
-        target_difficulty = manager.select_appropriate_difficulty(progress)
+        target_difficulty = first_difficulty
     
     # Get appropriate exercise type for the difficulty
     if target_difficulty:
@@ -355,7 +432,12 @@ def update_profile_with_difficulty_progress(profile: dict, session_exercises: li
     Integrates with existing profile update logic.
     """
     
-    manager = DifficultyProgressionManager()
+    manager = difficulty_manager
+    today = date.today()
+    
+    # Each grammar point is read from the profile once and written back
+    # once, however many exercises in the session touch it
+    progress_by_grammar = {}
     
     for exercise in session_exercises:
         grammar_focus = exercise.get('grammar_focus', [])
@@ -364,9 +446,13 @@ def update_profile_with_difficulty_progress(profile: dict, session_exercises: li
         
         # Update difficulty progress for each grammar point
         for grammar_id in grammar_focus:
-            profile = manager.update_difficulty_progress(
-                profile, grammar_id, exercise_type, is_correct
-            )
+            progress = progress_by_grammar.get(grammar_id)
+            if progress is None:
+                progress = progress_by_grammar[grammar_id] = manager.get_grammar_difficulty_progress(profile, grammar_id)
+            manager._record_attempt(progress, exercise_type, is_correct, today)
+    
+    for progress in progress_by_grammar.values():
+        manager._store_progress(profile, progress)
     
     return profile
 
@@ -389,6 +475,15 @@ if __name__ == '__main__':
     
     manager = DifficultyProgressionManager()
     
+    # Entries saved before recent_mask existed keep their recent_accuracy
+    legacy = {'total_attempts': 27, 'consecutive_correct': 2, 'reps': 20,
+              'lapses': 7, 'recent_accuracy': 0.25}
+    mask = _legacy_recent_mask(legacy)
+    assert (mask.bit_count() - 1) / (mask.bit_length() - 1) == legacy['recent_accuracy']
+    manager._apply_sm2_difficulty(legacy, True)
+    assert legacy['recent_accuracy'] == 3 / RECENT_WINDOW, legacy['recent_accuracy']
+    print("\n✅ Legacy entries keep their recent accuracy")
+    
     # Test progression for a grammar point
     grammar_id = '-이에요_예요'
     
@@ -413,7 +508,7 @@ if __name__ == '__main__':
         )
     
     # Show final summary
-    summary = manager.get_difficulty_summary(test_profile, grammar_id)
+    summary = manager.get_difficulty_summary(test_profile, grammar_id, full=True)
     print(f"\n📈 Final Summary for {grammar_id}:")
     print(f"  Max difficulty: {summary['current_max_difficulty']}")
     print(f"  Unlocked: {summary['unlocked_difficulties']}")
@@ -1,7 +1,11 @@
 import json
+import logging
+from engine.json_utils import loads
 from engine.llm_client import chat
 from engine.utils import sanitize_json_string
 
+logger = logging.getLogger(__name__)
+
 def evaluate_answer(prompt, user_answer, expected_answer, grammar_focus, target_language="Korean"):
     """
     Send user answer to GPT along with prompt and expected answer for structured feedback.
@@ -31,7 +35,8 @@ Return your evaluation in the following JSON format:
 }}
     """
 
-    #print(f' ==> [Line 10]: \033[38;2;15;179;254m[evaluation_prompt]\033[0m({type(evaluation_prompt).__name__}) = \033[38;2;73;189;127m{evaluation_prompt}\033[0m')
+    # Lazy %-formatting: the prompt is only interpolated with DEBUG enabled
+    logger.debug("evaluation_prompt = %s", evaluation_prompt)
 
     response_text = chat(
         messages=[
@@ -41,13 +46,14 @@ Return your evaluation in the following JSON format:
         temperature=0.2
     )
 
-    #print(f' ==> [Line 37]: \033[38;2;24;247;188m[response_text]\033[0m({type(response_text).__name__}) = \033[38;2;243;132;71m{response_text}\033[0m')
+    logger.debug("response_text = %s", response_text)
     
     try:
-        return json.loads(sanitize_json_string(response_text))
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so one
+        # except clause covers both parsers
+        return loads(sanitize_json_string(response_text))
     except json.JSONDecodeError:
-        print("⚠️ GPT response was not valid JSON:")
-        #print(response_text)
+        logger.warning("⚠️ GPT response was not valid JSON: %s", response_text)
         return {
             "is_correct": False,
             "corrected_answer": expected_answer,
@@ -60,8 +66,14 @@ def build_filled_sentence(prompt: str, user_response: str | list[str]) -> str:
     if isinstance(user_response, str):
         return prompt.replace("___", user_response, 1)
     elif isinstance(user_response, list):
-        filled = prompt
-        for fill in user_response:
-            filled = filled.replace("___", fill, 1)
-        return filled
+        # One pass over the prompt: answer i goes after the i-th piece;
+        # blanks without an answer stay as "___", extra answers are ignored
+        parts = prompt.split("___")
+        fills = user_response[:len(parts) - 1]
+        fills += ["___"] * (len(parts) - 1 - len(fills))
+        out = [parts[0]]
+        for fill, part in zip(fills, parts[1:]):
+            out.append(fill)
+            out.append(part)
+        return "".join(out)
     return prompt
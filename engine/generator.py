@@ -5,10 +5,11 @@ from engine.llm_client import chat
 from engine.planner import select_review_and_new_items
 from engine.utils import normalize_grammar_id, sanitize_json_string
 from engine.exercise_types import ExerciseTypeFactory, ExerciseConfig, generate_exercise_with_type
+from engine.json_utils import load_file
 from engine.vocab_manager import get_vocab_manager  # NEW: Use centralized vocab manager
 from engine.difficulty_system import (
-    DifficultyProgressionManager, 
     ExerciseDifficulty,
+    get_difficulty_manager,
     integrate_with_exercise_generator
 )
 
@@ -116,14 +117,12 @@ def log_debug_info(stage: str, data: dict, exercise_type: str = "unknown", file_
 
 def load_user_profile(path: str = None) -> dict:
     path = path or os.path.join(BASE_DIR, 'user_profile.json')
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_file(path)
 
 
 def load_curriculum(path: str = None) -> dict:
     path = path or os.path.join(BASE_DIR, 'curriculum', 'korean.json')
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_file(path)
 
 
 def generate_exercise(user_profile: dict,
@@ -446,7 +445,7 @@ def get_difficulty_info(profile_path: str = None) -> dict:
     Get difficulty progression information for the dashboard.
     """
     profile = load_user_profile(profile_path)
-    manager = DifficultyProgressionManager()
+    manager = get_difficulty_manager()
     
     # Get all grammar points with difficulty info
     grammar_summary = profile.get('grammar_summary', {})
@@ -0,0 +1,67 @@
+"""
+JSON helpers shared by the engine and the web app.
+
+Uses orjson when it is installed (it parses and serializes UTF-8 directly
+in native code) and falls back to the standard library otherwise, so the
+output format is the same either way: UTF-8, non-ASCII characters kept
+as-is, optional 2-space indentation.
+
+File: engine/json_utils.py
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from a str or bytes object."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def load_file(path: str):
+    """Read and parse a JSON file in a single read."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump_file(path: str, obj, indent: bool = True, sync: bool = False) -> None:
+    """
+    Serialize obj and write it to path with a single write.
+    With sync=True the data is flushed to disk (fsync) before returning.
+    """
+    data = dumps(obj, indent=indent)
+    with open(path, 'wb') as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def replace_file(path: str, obj, indent: bool = True) -> None:
+    """
+    Atomically replace path with obj: the data is written to a temporary
+    file next to it, fsynced, and renamed over path, so readers and crashes
+    never see a half-written file.
+    """
+    tmp_path = f"{path}.tmp"
+    dump_file(tmp_path, obj, indent=indent, sync=True)
+    os.replace(tmp_path, path)
@@ -18,6 +18,16 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if OPENAI_API_KEY is None:
     raise EnvironmentError("Missing OPENAI_API_KEY environment variable. Please create 'api-key.env' and set it.")
 
+# --- Reuse HTTP clients across calls (keeps connections alive) ---
+_openai_client = None
+_local_session = requests.Session()
+
+def _get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    return _openai_client
+
 def chat(messages, provider=None, model=None, temperature=None):
     """
     Sends a chat request to either OpenAI (v1.x) or a local OpenAI-compatible LLM.
@@ -27,7 +37,7 @@ def chat(messages, provider=None, model=None, temperature=None):
 
     if provider == "openai":
 
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        client = _get_openai_client()
 
         response = client.chat.completions.create(
             model=model or config.get("openai_model", "gpt-4"),
@@ -50,7 +60,7 @@ def chat(messages, provider=None, model=None, temperature=None):
         headers = {"Content-Type": "application/json"}
 
         try:
-            response = requests.post(endpoint, json=payload, headers=headers)
+            response = _local_session.post(endpoint, json=payload, headers=headers)
             response.raise_for_status()
             return response.json()["choices"][0]["message"]["content"].strip()
         except Exception as e:
@@ -1,8 +1,22 @@
 import os
-import json
+import threading
 from datetime import datetime
 
+from engine.json_utils import dump_file, dumps, load_file, loads
+
 SESSION_DIR = "sessions"
+# One JSON line per logged session: session_id, date, total_exercises, accuracy_rate
+SESSION_INDEX_FILE = os.path.join(SESSION_DIR, "_index.jsonl")
+
+# Parsed session summaries keyed by filename -> (mtime_ns, entry).
+# Session logs are written once per session, so only new or rewritten
+# files have to be parsed again on later reads.
+_SUMMARY_CACHE = {}
+_SUMMARY_CACHE_LOCK = threading.Lock()
+_INDEX_LOCK = threading.Lock()
+
+# Filename of the newest session log; set on write, computed once on first read
+_latest_session_file = None
 
 def ensure_session_dir():
     if not os.path.exists(SESSION_DIR):
@@ -19,12 +33,29 @@ def log_exercise_to_session(session_log):
     session_id = session_log["session_id"]
     filename = os.path.join(SESSION_DIR, f"{session_id}.json")
 
+    global _latest_session_file
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(session_log, f, indent=2, ensure_ascii=False)
+        dump_file(filename, session_log, sync=True)
         print(f"📁 Session log updated: {filename}")
+        # Session ids are timestamps, so the newest log has the largest name
+        _latest_session_file = max(filter(None, (_latest_session_file, f"{session_id}.json")))
     except Exception as e:
         print(f"⚠️ Failed to save session log: {e}")
+        return
+
+    # The summary is already in memory, so seed the cache instead of
+    # parsing the file back on the next history or summary request
+    with _SUMMARY_CACHE_LOCK:
+        _SUMMARY_CACHE[f"{session_id}.json"] = (os.stat(filename).st_mtime_ns, {
+            "session_id": session_id,
+            "date": session_log.get("date", "Unknown Date"),
+            "summary": session_log.get("summary"),
+        })
+
+    try:
+        append_session_index(session_log)
+    except Exception as e:
+        print(f"⚠️ Failed to update session index: {e}")
 
 
 def load_session_log(session_id):
@@ -36,5 +67,199 @@ def load_session_log(session_id):
         print(f"⚠️ Session log {session_id} not found.")
         return None
 
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_file(filename)
+
+
+def _cached_summary(name, path, mtime):
+    """Summary entry for one session file, parsed only if not cached for this mtime."""
+    cached = _SUMMARY_CACHE.get(name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    session_log = load_file(path)
+    entry = {
+        "session_id": session_log.get("session_id", name),
+        "date": session_log.get("date", "Unknown Date"),
+        "summary": session_log.get("summary"),
+    }
+    _SUMMARY_CACHE[name] = (mtime, entry)
+    return entry
+
+
+def latest_session_file():
+    """Filename of the newest session log, or None if there are no sessions."""
+    global _latest_session_file
+    if _latest_session_file is None or not os.path.exists(os.path.join(SESSION_DIR, _latest_session_file)):
+        try:
+            names = [e.name for e in os.scandir(SESSION_DIR) if e.name.endswith(".json")]
+        except FileNotFoundError:
+            return None
+        _latest_session_file = max(names) if names else None
+    return _latest_session_file
+
+
+def load_latest_session_summary():
+    """Return the summary of the newest session log, or None."""
+    latest = latest_session_file()
+    if latest is None:
+        return None
+    path = os.path.join(SESSION_DIR, latest)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _SUMMARY_CACHE_LOCK:
+        return _cached_summary(latest, path, mtime)["summary"]
+
+
+def load_session_summaries():
+    """
+    Return the summaries of all logged sessions, newest first.
+
+    Each entry only holds 'session_id', 'date' and 'summary' - the
+    exercise lists are never kept in memory. Files are re-parsed only
+    when they are new or their mtime changed since the last call.
+    """
+    try:
+        entries = [e for e in os.scandir(SESSION_DIR) if e.name.endswith(".json") and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+    with _SUMMARY_CACHE_LOCK:
+        for entry in entries:
+            _cached_summary(entry.name, entry.path, entry.stat().st_mtime_ns)
+
+        # Forget files that were removed from the sessions directory
+        present = {e.name for e in entries}
+        for name in [n for n in _SUMMARY_CACHE if n not in present]:
+            del _SUMMARY_CACHE[name]
+
+        return [_SUMMARY_CACHE[name][1] for name in sorted(_SUMMARY_CACHE, reverse=True)]
+
+
+def _index_entry(session_id, date, summary):
+    return {
+        "session_id": session_id,
+        "date": date,
+        "total_exercises": summary.get("total_exercises", 0),
+        "accuracy_rate": summary.get("accuracy_rate", 0.0),
+    }
+
+
+def _rebuild_session_index():
+    """Write the index from the session files on disk (oldest first)."""
+    ensure_session_dir()
+    lines = [
+        dumps(_index_entry(s["session_id"], s["date"], s["summary"])) + b"\n"
+        for s in reversed(load_session_summaries())
+        if s["summary"]
+    ]
+    with open(SESSION_INDEX_FILE, 'wb') as f:
+        f.write(b"".join(lines))
+
+
+def append_session_index(session_log):
+    """
+    Append one line for a freshly written session log to the index.
+    Builds the index from the existing session files the first time.
+    """
+    summary = session_log.get("summary")
+    if not summary:
+        return
+
+    with _INDEX_LOCK:
+        if not os.path.exists(SESSION_INDEX_FILE):
+            # The new session file is already on disk, so it is included
+            _rebuild_session_index()
+            return
+
+        entry = _index_entry(session_log["session_id"], session_log.get("date", "Unknown Date"), summary)
+        line = dumps(entry) + b"\n"
+        with open(SESSION_INDEX_FILE, 'a+b') as f:
+            # An append cut short (crash, full disk) leaves a line without
+            # its newline; start a fresh line so this entry stays readable
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+
+
+def _lines_reversed(f, end, block_size=8192):
+    """Yield the lines of f before offset `end`, last line first, reading backwards in blocks."""
+    pos = end
+    head = b""
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + head).split(b"\n")
+        # The first piece may continue in the previous block
+        head = lines.pop(0)
+        yield from reversed(lines)
+    yield head
+
+
+def iter_session_index(limit=None):
+    """
+    Yield session history rows from the index, newest first.
+
+    A session that was logged more than once (same session_id) is only
+    yielded with its latest entry. Lines that are not a valid entry (e.g.
+    left by an interrupted append) are skipped. The index is read
+    backwards from its end, so a `limit` (or a caller that stops early)
+    only reads and decodes the newest lines, not the whole file.
+    """
+    with _INDEX_LOCK:
+        if not os.path.exists(SESSION_INDEX_FILE):
+            if not os.path.isdir(SESSION_DIR):
+                return
+            _rebuild_session_index()
+
+        f = open(SESSION_INDEX_FILE, 'rb')
+        # Lines appended after this point are not read, so a half-written
+        # line is never decoded
+        end = f.seek(0, os.SEEK_END)
+
+    with f:
+        count = 0
+        seen = set()
+        for line in _lines_reversed(f, end):
+            if limit is not None and count >= limit:
+                return
+            if not line.strip():
+                continue
+            try:
+                entry = loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict) or "session_id" not in entry:
+                continue
+            if entry["session_id"] in seen:
+                continue
+            seen.add(entry["session_id"])
+            count += 1
+            yield entry
+
+
+def _stat_version(path):
+    """Short version token for a file, changing whenever it is rewritten."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def session_index_version():
+    """Version token of the session index, or None if it does not exist yet."""
+    return _stat_version(SESSION_INDEX_FILE)
+
+
+def latest_session_version():
+    """Version token of the newest session log, or None if there are no sessions."""
+    latest = latest_session_file()
+    if latest is None:
+        return None
+    version = _stat_version(os.path.join(SESSION_DIR, latest))
+    return f"{latest[:-5]}-{version}" if version else None
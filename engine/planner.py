@@ -1,7 +1,7 @@
-import json
 import os
 from datetime import datetime
-from engine.curriculum import load_curriculum
+from engine.curriculum import get_level_index
+from engine.json_utils import load_file
 from engine.utils import normalize_grammar_id
 from engine.vocab_manager import get_vocab_manager  # NEW: Use centralized vocab manager
 
@@ -14,8 +14,7 @@ vocab_manager = get_vocab_manager()
 
 def load_user_profile(path: str = None) -> dict:
     path = path or os.path.join(BASE_DIR, 'user_profile.json')
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_file(path)
 
 
 def should_introduce_new_grammar(profile: dict) -> bool:
@@ -242,7 +241,7 @@ def select_review_and_new_items(
     """
     # Load data
     profile = load_user_profile(profile_path)
-    curriculum = load_curriculum()
+    level_index = get_level_index()
 
     # MUCH MORE CONSERVATIVE preferences with stricter defaults
     prefs = profile.get('learning_preferences', {})
@@ -311,7 +310,7 @@ def select_review_and_new_items(
         
         if mastery_gate_approved:
             user_level = profile.get('user_level', 'beginner')
-            level_points = [pt for pt in curriculum.get('grammar_points', []) if pt.get('level') == user_level]
+            level_points = level_index.get(user_level, [])
             
             grammar_summary = profile.get('grammar_summary', {})
             seen = {normalize_grammar_id(gid) for gid in grammar_summary.keys()}
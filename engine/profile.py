@@ -1,13 +1,16 @@
+import heapq
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
+from engine.json_utils import load_file, replace_file
 from engine.utils import normalize_grammar_id
 import re
 import shutil
 import sys
 import os
+import threading
 from pathlib import Path
-from engine.difficulty_system import update_profile_with_difficulty_progress
+from engine.difficulty_system import get_difficulty_manager, update_profile_with_difficulty_progress
 
 # Constants for MUCH MORE CONSERVATIVE SM-2 algorithm
 MIN_EASE_FACTOR = 1.3
@@ -62,8 +65,7 @@ def load_user_profile(path: str) -> dict:
     Load user profile with automatic grammar ID migration.
     """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            profile = json.load(f)
+        profile = load_file(path)
         
         # Perform automatic migration
         migrated_profile, migration_performed, migration_log = migrate_grammar_profile_data(profile)
@@ -86,8 +88,38 @@ def load_user_profile(path: str) -> dict:
 
 
 def save_user_profile(profile: dict, path: str = 'user_profile.json') -> None:
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(profile, f, ensure_ascii=False, indent=2)
+    # Atomic: dashboard endpoints may read the profile while it is saved
+    replace_file(path, profile)
+    # Next get_cached_profile() call re-reads the file
+    _PROFILE_CACHE.pop(path, None)
+
+
+# Parsed profiles keyed by path -> (mtime_ns, profile)
+_PROFILE_CACHE = {}
+_PROFILE_CACHE_LOCK = threading.Lock()
+
+
+def get_cached_profile(path: str) -> dict:
+    """
+    Load user profile, re-reading the file only when its mtime changed.
+    The returned dict is shared between callers - treat it as read-only.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    with _PROFILE_CACHE_LOCK:
+        cached = _PROFILE_CACHE.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        profile = load_user_profile(path)
+        # Keyed on the mtime seen before reading: a save landing after the
+        # read then shows up as a change. When load_user_profile wrote a
+        # migrated or default profile itself, the next call re-reads once.
+        _PROFILE_CACHE[path] = (mtime, profile)
+        return profile
 
 # Add migration functionality
 def migrate_grammar_profile_data(profile: dict) -> tuple:
@@ -578,11 +610,11 @@ def debug_grammar_ids(profile: dict):
     
     # Show SRS stats for top grammar points
     print(f"\n📈 SRS Status (top 5 by reps):")
-    sorted_grammar = sorted(
-        grammar_summary.items(), 
-        key=lambda x: x[1].get('reps', 0), 
-        reverse=True
-    )[:5]
+    sorted_grammar = heapq.nlargest(
+        5,
+        grammar_summary.items(),
+        key=lambda x: x[1].get('reps', 0)
+    )
     
     for gid, data in sorted_grammar:
         reps = data.get('reps', 0)
@@ -654,9 +686,7 @@ def get_mastery_progression_summary(profile: dict) -> dict:
     """
     Get a comprehensive summary of learning progression including difficulty mastery.
     """
-    from engine.difficulty_system import DifficultyProgressionManager
-    
-    manager = DifficultyProgressionManager()
+    manager = get_difficulty_manager()
     grammar_summary = profile.get('grammar_summary', {})
     
     # Traditional mastery stats
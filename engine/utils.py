@@ -1,12 +1,14 @@
 import re
 import json
+import unicodedata
+from functools import lru_cache
 from engine.llm_client import chat
 from typing import Set, Dict, List, Tuple
 
 def normalize_answer_for_comparison(text: str) -> str:
     """
     Normalize answer text for comparison by removing trailing punctuation
-    and standardizing whitespace.
+    and standardizing whitespace, Unicode composition and case.
     
     Args:
         text: The text to normalize
@@ -17,8 +19,12 @@ def normalize_answer_for_comparison(text: str) -> str:
     if not isinstance(text, str):
         return str(text)
     
+    # Compose Hangul jamo some IMEs emit decomposed (NFD) so that equal
+    # syllables compare equal, and ignore case for Latin-script answers
+    normalized = unicodedata.normalize('NFC', text).casefold()
+    
     # Remove leading/trailing whitespace
-    normalized = text.strip()
+    normalized = normalized.strip()
     
     # Remove trailing punctuation (but preserve punctuation within the text)
     # Common punctuation that might appear at the end of Korean sentences
@@ -36,6 +42,8 @@ def normalize_answer_for_comparison(text: str) -> str:
     
     return normalized
 
+# Pure string -> string mapping; grammar ids repeat heavily across a session
+@lru_cache(maxsize=1024)
 def normalize_grammar_id(raw_id: str) -> str:
     """
     Enhanced normalization that creates consistent grammar IDs.
@@ -135,11 +143,14 @@ def normalize_grammar_id(raw_id: str) -> str:
     s = s.strip('_')            # Remove leading/trailing underscores
     return s
 
+_THINK_BLOCK = re.compile(r"<think>.*?</think>", re.DOTALL)
+
 def sanitize_json_string(s):
     s = s.strip()
 
     # Remove <think>...</think> and anything before first {
-    s = re.sub(r"<think>.*?</think>", "", s, flags=re.DOTALL)
+    if "<think>" in s:
+        s = _THINK_BLOCK.sub("", s)
     
     # Keep only content between first "{" and last "}"
     if "{" in s and "}" in s:
@@ -147,7 +158,6 @@ def sanitize_json_string(s):
         end = s.rfind("}")
         s = s[start:end+1]
 
-    s = s.replace('"', '"').replace('"', '"').replace("'", "'")
     return s
 
 def migrate_grammar_profile(profile: dict) -> Tuple[dict, List[str]]:
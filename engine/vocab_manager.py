@@ -10,14 +10,16 @@ This module provides a singleton-pattern vocabulary manager that:
 File: engine/vocab_manager.py
 """
 
-import json
 import os
+import shutil
 from typing import Dict, List, Optional, Set
 from dataclasses import dataclass
 from pathlib import Path
 
+from engine.json_utils import dump_file, load_file
 
-@dataclass
+
+@dataclass(slots=True)
 class VocabEntry:
     """Structured representation of a vocabulary entry"""
     word: str
@@ -54,6 +56,7 @@ class VocabularyManager:
         if not VocabularyManager._initialized:
             self._vocab_data: Dict[str, Dict] = {}
             self._vocab_entries: Dict[str, VocabEntry] = {}
+            self._stats: Optional[Dict] = None
             self._base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
             self._vocab_file_path = os.path.join(self._base_dir, 'vocab_data.json')
             self._load_vocabulary()
@@ -61,9 +64,9 @@ class VocabularyManager:
     
     def _load_vocabulary(self) -> None:
         """Load and process vocabulary data from file"""
+        self._stats = None  # recomputed from the new data on next get_stats()
         try:
-            with open(self._vocab_file_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            raw_data = load_file(self._vocab_file_path)
             
             # Handle format conversion
             if isinstance(raw_data, list):
@@ -109,13 +112,11 @@ class VocabularyManager:
             # Create backup of original file
             backup_path = self._vocab_file_path + '.backup'
             if not os.path.exists(backup_path):
-                import shutil
                 shutil.copy2(self._vocab_file_path, backup_path)
                 print(f"📦 Created backup: {backup_path}")
             
             # Save converted format
-            with open(self._vocab_file_path, 'w', encoding='utf-8') as f:
-                json.dump(self._vocab_data, f, ensure_ascii=False, indent=2)
+            dump_file(self._vocab_file_path, self._vocab_data)
             print("💾 Saved converted vocabulary format to file")
             
         except Exception as e:
@@ -151,6 +152,25 @@ class VocabularyManager:
         """Get raw data for a specific word"""
         return self._vocab_data.get(word)
     
+    def get_word_data_bulk(self, words: List[str]) -> List[Dict]:
+        """
+        Get summary rows (word, translation, frequency_rank, topik_level, tags)
+        for several words at once. Unknown words are skipped.
+        """
+        vocab_data = self._vocab_data
+        rows = []
+        for word in words:
+            data = vocab_data.get(word)
+            if data:
+                rows.append({
+                    'word': word,
+                    'translation': data.get('translation', ''),
+                    'frequency_rank': data.get('frequency_rank'),
+                    'topik_level': data.get('topik_level'),
+                    'tags': data.get('tags')
+                })
+        return rows
+    
     def get_word_entry(self, word: str) -> Optional[VocabEntry]:
         """Get structured entry for a specific word"""
         return self._vocab_entries.get(word)
@@ -281,9 +301,11 @@ class VocabularyManager:
         return [word for word, _ in matches[:limit]]
     
     def get_stats(self) -> Dict[str, any]:
-        """Get vocabulary database statistics"""
+        """Get vocabulary database statistics (computed once per load)"""
         if not self._vocab_data:
             return {}
+        if self._stats is not None:
+            return self._stats
         
         # Count by levels
         level_counts = {}
@@ -303,13 +325,14 @@ class VocabularyManager:
             if data.get('frequency_rank') is not None:
                 freq_available += 1
         
-        return {
+        self._stats = {
             'total_words': len(self._vocab_data),
             'by_topik_level': level_counts,
             'by_tags': tag_counts,
             'with_frequency_rank': freq_available,
             'frequency_coverage': f"{freq_available/len(self._vocab_data)*100:.1f}%"
         }
+        return self._stats
     
     def reload(self) -> None:
         """Reload vocabulary data from file (useful for development)"""
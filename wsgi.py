@@ -0,0 +1,13 @@
+"""
+WSGI entry point for running the app under a production server, e.g.
+
+    gunicorn -w 1 -k gthread --threads 8 --timeout 120 wsgi:app
+
+The active study session and the loaded user profile live in process
+memory (see ExerciseSessionManager in app.py), so run a single worker
+process and let the thread pool overlap the slow LLM calls.
+"""
+
+from app import app
+
+__all__ = ["app"]